@@ -1,4 +1,6 @@
 import os
+import functools
+import configparser
 
 #: Path to ini file for containing username and password by wildcard domain.
 CNFG_DIR = os.environ.get('ERRBOT_CFG_DIR', '/etc/errbot')
@@ -14,6 +16,7 @@ CONFIG_FILEPATH_CHOICES = [
 DEFAULT_CONFIG = {
     'START_DATE': '01/01/2017',  # format: DD/MM/YYYY
     'INTERVAL': 5*60,  # refresh time in seconds#
+    'PARSE_PROCESSES': 0,  # processes parsing the feeds, 0 parses in the fetching thread
 }
 
 
@@ -21,3 +24,25 @@ def get_config_filepath():
     for f in CONFIG_FILEPATH_CHOICES:
         if os.path.exists(f):
             return f
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_ini(abspath, mtime):
+    ini = configparser.ConfigParser()
+    ini.read(abspath)
+    return {header: dict(ini[header]) for header in ini.sections()}
+
+
+def read_ini_file(filepath):
+    """Return the sections of the ini file at `filepath` as plain dicts, by header.
+
+    The parsed file is cached until the file modification time changes.
+    Nonexistent files yield no sections, like `ConfigParser.read` does.
+    Callers must not modify the returned dicts.
+    """
+    abspath = os.path.abspath(os.path.expanduser(filepath))
+    try:
+        mtime = os.path.getmtime(abspath)
+    except OSError:
+        mtime = None
+    return _parse_ini(abspath, mtime)
@@ -0,0 +1,107 @@
+"""
+Minimal RSS/Atom parser for the few fields this plugin uses.
+"""
+from io import BytesIO
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+
+#: Entry child elements we keep, by local name, and the feedparser key they map to.
+ENTRY_FIELDS = {
+    'title': 'title',
+    'id': 'id',
+    'guid': 'id',
+    'published': 'published',
+    'pubDate': 'published',
+    'issued': 'published',
+    'date': 'updated',
+    'updated': 'updated',
+}
+
+_RDF_ABOUT = '{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about'
+
+
+def _localname(elem):
+    return etree.QName(elem).localname
+
+
+def _entry_from_element(elem):
+    entry = {}
+    for child in elem:
+        if not isinstance(child.tag, str):
+            # Comments and processing instructions.
+            continue
+        name = _localname(child)
+        if name == 'link':
+            href = child.get('href')
+            if href is None:
+                entry.setdefault('link', (child.text or '').strip())
+            elif child.get('rel', 'alternate') == 'alternate':
+                entry.setdefault('link', href)
+        elif name in ENTRY_FIELDS:
+            entry.setdefault(ENTRY_FIELDS[name], (child.text or '').strip())
+    # RSS 1.0 (RDF) items are identified by their rdf:about.
+    if elem.get(_RDF_ABOUT):
+        entry.setdefault('id', elem.get(_RDF_ABOUT))
+    return entry
+
+
+def parse_feed_fast(content: bytes):
+    """Parse the feed title and the entries of an RSS/Atom document with lxml.
+
+    Only the feed title and the title, link, id, published and updated fields
+    of the entries are extracted, in the same layout `feedparser.parse` uses.
+
+    :param bytes content: the raw feed document
+    :raises ValueError: if the document has no feed title
+    :raises lxml.etree.XMLSyntaxError: if the document is not well-formed
+    """
+    feed = {'feed': {}, 'entries': []}
+    events = etree.iterparse(
+        BytesIO(content),
+        events=('end',),
+        tag=('{*}item', '{*}entry', '{*}title'),
+        resolve_entities=False,
+        no_network=True
+    )
+    for __, elem in events:
+        name = _localname(elem)
+        if name == 'title':
+            parent = elem.getparent()
+            if parent is not None and _localname(parent) in ('channel', 'feed'):
+                feed['feed'].setdefault('title', (elem.text or '').strip())
+        else:
+            feed['entries'].append(_entry_from_element(elem))
+            # Free the entries we are done with.
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+    if not feed['feed'].get('title'):
+        raise ValueError('No feed title found.')
+    return feed
+
+
+def parse_feed(content: bytes, content_type: str = None):
+    """Parse the feed in `content`, with lxml if available, otherwise or on error with feedparser.
+
+    :param bytes content: the raw feed document
+    :param str content_type: the Content-Type header the document was served with, if any
+    """
+    if etree is not None:
+        try:
+            return parse_feed_fast(content)
+        except (etree.XMLSyntaxError, ValueError):
+            pass
+    # feedparser is slow to import and only needed as a fallback.
+    import feedparser
+
+    response_headers = {'content-type': content_type} if content_type else None
+    feed = feedparser.parse(content, response_headers=response_headers)
+    if 'bozo_exception' in feed:
+        # The exception of a malformed feed cannot be pickled back from a parse process.
+        feed['bozo_exception'] = str(feed['bozo_exception'])
+    return feed
@@ -1,3 +1,5 @@
+from urllib.parse import urlsplit
+
 import requests
 
 
@@ -7,29 +9,86 @@ class Authenticator:
         self.username = username
         self.password = password
         self.type = login_type
+        self._authenticated = False
 
     def login(self, session: requests.Session) -> requests.Session:
+        """Log in on `session`, unless that has already been done."""
+        if self._authenticated:
+            return session
+
         if self.type == 'csrf':
-            return self._csrf_login(session)
+            session = self._csrf_login(session)
         else:
-            return self._plain_login(session)
+            session = self._plain_login(session)
+        self._authenticated = True
+        return session
+
+    def reauthenticate(self, session: requests.Session) -> requests.Session:
+        """Forget the previous login and log in again on `session`."""
+        self._authenticated = False
+        return self.login(session)
 
     def _plain_login(self, session: requests.Session) -> requests.Session:
         session.auth = self.username, self.password
         return session
 
     def _csrf_login(self, session: requests.Session) -> requests.Session:
-        django_csrf_login(
+        # Reuse the token the session already got from this site, if any.
+        token = session_csrf_token(session=session, login_url=self.url)
+        response = self._post_csrf_login(session, token)
+        if token is not None and response.status_code == 403:
+            # The token was rejected, get a fresh one from the login page.
+            response = self._post_csrf_login(session, None)
+        response.raise_for_status()
+        return session
+
+    def _post_csrf_login(self, session: requests.Session, token: str = None) -> requests.Response:
+        return django_csrf_login(
             session=session,
             login_url=self.url,
             username=self.username,
             password=self.password,
-            next_url=self.url
+            next_url=self.url,
+            csrftoken=token
         )
-        return session
 
 
-def django_csrf_login(session, login_url, username, password, next_url=None):
+def session_csrf_token(session, login_url):
+    """ Get the CSRF token `session` already holds for the site of `login_url`.
+
+    :param session: requests.Session
+
+    :param login_url: str
+        The URL where the login is performed.
+
+    :returns: str
+        The token, None if the session has no valid one.
+    """
+    host = urlsplit(login_url).hostname or ''
+    for cookie in session.cookies:
+        if cookie.name != 'csrftoken' or cookie.is_expired():
+            continue
+        domain = cookie.domain.lstrip('.')
+        if host == domain or host.endswith('.' + domain):
+            return cookie.value
+    return None
+
+
+def fetch_csrf_token(session, login_url):
+    """ Get the CSRF token of a Django application from its login page.
+
+    :param session: requests.Session
+
+    :param login_url: str
+        The URL where the login is performed.
+
+    :returns: str
+        The token.
+    """
+    return session.get(login_url).cookies['csrftoken']
+
+
+def django_csrf_login(session, login_url, username, password, next_url=None, csrftoken=None):
     """ Perform standard authentication with CSRF on a Django application.
 
     :param session: requests.Session
@@ -45,13 +104,18 @@ def django_csrf_login(session, login_url, username, password, next_url=None):
         The URL from where you want to pick information.
         Will return the response from the login_url if None.
 
+    :param csrftoken: str, optional
+        A CSRF token obtained earlier from the login page.
+        Will be fetched from the login_url if None.
+
     :returns: requests.Response
         The response from the last POST.
 
     :note: `session` will be modified.
     """
     # authentication
-    csrftoken = session.get(login_url).cookies['csrftoken']
+    if csrftoken is None:
+        csrftoken = fetch_csrf_token(session=session, login_url=login_url)
 
     if next_url is None:
         next_url = '/'
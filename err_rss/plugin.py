@@ -1,21 +1,55 @@
 """
 Errbot plugin to redirect RSS feeds.
 """
-import os
+import math
+import time
 import logging
+import functools
+import heapq
 import threading
-import configparser
+from datetime import datetime
+from collections import OrderedDict, defaultdict
+from urllib.parse import urlsplit
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 import arrow
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from errbot import BotPlugin, botcmd, arg_botcmd
-import dateutil.parser as dparser
 
-from typing import Union
+from typing import Dict, Union
 from .login import Authenticator
 from .room_feed import Feed
-from .config import DEFAULT_CONFIG, get_config_filepath
-from .rss_client import FeedReader, header_matches_url, published_date
+from .config import DEFAULT_CONFIG, get_config_filepath, read_ini_file
+from .rss_client import NOT_MODIFIED, FeedReader, HeaderIndex, entry_id, published_date
+
+#: Maximum number of feeds fetched at the same time. The HTTP connection pool
+#: is sized after it so that concurrent fetches can keep their connections alive.
+MAX_FETCH_WORKERS = 32
+
+#: Formats an entry as a chat message.
+_ENTRY_FORMATTER = '[{title}]({link}) --- {when}'.format
+
+#: Number of sent entry ids remembered per room to avoid posting an entry twice.
+SENT_CACHE_SIZE = 1024
+
+#: Number of handled entry ids remembered per feed to skip them in the next checks.
+SEEN_CACHE_SIZE = 1024
+
+#: Seconds to wait for a check in progress when stopping the scheduler.
+STOP_CHECK_TIMEOUT = 60
+
+#: Date formats RSS (RFC 822) and Atom (RFC 3339) feeds usually use, and the
+#: DD/MM/YYYY format of START_DATE, tried before any generic parser.
+_FAST_DATE_FORMATS = (
+    '%a, %d %b %Y %H:%M:%S %z',
+    '%a, %d %b %Y %H:%M:%S GMT',
+    '%Y-%m-%dT%H:%M:%S%z',
+    '%Y-%m-%dT%H:%M:%SZ',
+    '%d/%m/%Y',
+)
 
 
 def since(target_time):
@@ -23,11 +57,34 @@ def since(target_time):
     return lambda entry: published_date(entry) > target_time
 
 
+@functools.lru_cache(maxsize=4096)
 def read_date(dt):
     """This reads a date in an unknown format."""
+    # arrow.get(None) would be the current time, cached forever here.
+    if not isinstance(dt, str):
+        raise TypeError(f'Expected a date string, got {dt!r}.')
+    for fmt in _FAST_DATE_FORMATS:
+        try:
+            return arrow.Arrow.fromdatetime(datetime.strptime(dt, fmt))
+        except ValueError:
+            pass
+    # dateutil is slow to import and only needed for unusual date formats.
+    # Note arrow.get(dt) is no shortcut, it reads any date with a year in it
+    # as January 1st of that year.
+    import dateutil.parser as dparser
     return arrow.get(dparser.parse(dt))
 
 
+def entry_date(entry):
+    """Return the publication date of a feed entry, or its update date, or None if it has neither."""
+    # feedparser already parsed the date into a UTC struct_time.
+    parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+    if parsed:
+        return arrow.Arrow(*parsed[:6])
+    date = published_date(entry) or entry.get('updated')
+    return read_date(date) if date else None
+
+
 def try_method(f):
     try:
         return f()
@@ -47,25 +104,64 @@ class Rss(BotPlugin):
     def activate(self):
         super().activate()
         self.session = requests.Session()
+        # Keep connections to the feed hosts alive across checks.
+        adapter = HTTPAdapter(
+            pool_connections=MAX_FETCH_WORKERS,
+            pool_maxsize=2 * MAX_FETCH_WORKERS,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                respect_retry_after_header=True,
+                raise_on_status=False
+            )
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # Feeds are very compressible, always ask for a compressed body.
+        self.session.headers.update({
+            'Accept-Encoding': 'gzip, deflate',
+            'User-Agent': 'err-rss',
+        })
 
         config_file_path = get_config_filepath()
         if config_file_path:
             self.read_ini(config_file_path)
         else:
             self.log.error('Could not find any configuration file.')
+            self.ini = {}
+            self._ini_index = HeaderIndex([])
+            self._url_config_cache = {}
 
         self._feed_readers = {}
+        # Serializes the writes of the feeds between the checks and the commands.
+        self._feeds_lock = threading.Lock()
+        # Parsing big feeds is CPU bound, optionally move it out of the GIL.
+        parse_processes = self.config.get('PARSE_PROCESSES')
+        self._parse_pool = ProcessPoolExecutor(max_workers=parse_processes) if parse_processes else None
+        self._sent_cache = self['sent_cache'] if 'sent_cache' in self else {}
+        self._seen_entries = {}
+        # Titles of the feeds watched by each room.
+        self._room_to_feeds = defaultdict(set)
+        for title, feed in self.feeds.items():
+            for room_id in feed.roomfeeds:
+                self._room_to_feeds[room_id].add(title)
 
-        # Manually use a timer, since the poller implementation in errbot
-        # breaks if you try to change the polling interval.
+        # Manually use a scheduler thread, since the poller implementation in
+        # errbot breaks if you try to change the polling interval.
         self.checker = None
-        then = arrow.get()
-        self.delta = arrow.get() - then
+        self._stop_evt = None
+        self.delta_seconds = 0.0
         self.check_feeds()
 
     def deactivate(self):
-        super().deactivate()
+        # Stop checking before the storage is closed, a check in progress
+        # still writes to it and uses the parse pool.
         self.stop_checking_feeds()
+        if self._parse_pool:
+            self._parse_pool.shutdown(wait=False)
+            self._parse_pool = None
+        super().deactivate()
 
     def read_ini(self, filepath):
         """Read and store the configuration in the ini file at fileos.path.
@@ -75,40 +171,59 @@ class Rss(BotPlugin):
 
         :param str filepath: path to the ini file to use for configuration
         """
-        self.ini = configparser.ConfigParser()
-        self.ini.read(os.path.expanduser(filepath))
-        self.log.info(f'--------------------------{self.ini}')
+        ini = read_ini_file(filepath)
+        if ini is getattr(self, 'ini', None):
+            # The file did not change since it was last read.
+            return
+        self.ini = ini
         self.log.info('Read {} sections from {}'.format(len(self.ini), filepath))
+        self._ini_index = HeaderIndex(self.ini.items())
+        self._url_config_cache = {}
 
     def schedule_next_check(self):
-        """Schedule the next feed check.
+        """Start the scheduler thread that checks the feeds every `interval` seconds.
 
-        This method ensures any pending check for new feed entries is canceled
-        before scheduling the next one.
+        This method ensures any running scheduler is stopped before starting
+        the new one, so a changed interval takes effect immediately.
         """
         self.stop_checking_feeds()
         if self.interval:
-            def job():
-                return try_method(self.check_feeds)
-
-            self.checker = threading.Timer(self.interval, job)
+            self._stop_evt = threading.Event()
+            self.checker = threading.Thread(
+                target=self._scheduler_loop,
+                args=(self._stop_evt,),
+                name='err-rss-checker',
+                daemon=True
+            )
             self.checker.start()
-            self.log.info('Scheduled next check in {}s'.format(self.interval))
+            self.log.info('Scheduled checks every {}s'.format(self.interval))
         else:
             self.log.info('Scheduling disabled since interval is 0s.')
 
+    def _scheduler_loop(self, stop_evt):
+        """Check the feeds every `interval` seconds until `stop_evt` is set."""
+        while not stop_evt.wait(self.interval):
+            try_method(lambda: self.check_feeds(repeat=False))
+
     def stop_checking_feeds(self):
-        """Stop any pending check for new feed entries."""
+        """Stop any pending check for new feed entries.
+
+        Unless called from the scheduler thread itself, this waits up to
+        `STOP_CHECK_TIMEOUT` seconds for a check in progress to finish, so
+        that two checks do not run at the same time.
+        """
         if self.checker:
-            self.checker.cancel()
+            self._stop_evt.set()
+            if self.checker is not threading.current_thread():
+                self.checker.join(timeout=STOP_CHECK_TIMEOUT)
+                if self.checker.is_alive():
+                    self.log.warning(f'The check in progress did not finish within {STOP_CHECK_TIMEOUT}s, '
+                                     'it will stop once done.')
+            self.checker = None
             self.log.info('Pending check canceled.')
         else:
             self.log.info('No pending checks to cancel.')
 
-    @staticmethod
-    def entry_format_function():
-        return '[{title}]({link}) --- {when}'.format
-
     @property
     def feeds(self):
         """A dict with RSS feeds data."""
@@ -120,36 +235,81 @@ class Rss(BotPlugin):
     def check_feeds(self, repeat=True):
         """Check for any new feed entries and report them to each corresponding room.
 
-        :param bool repeat: whether or not to schedule the next check
+        :param bool repeat: whether or not to (re)start the scheduler thread
         """
-        start_time = arrow.get()
+        start_time = time.monotonic()
         self.log.info('Starting feed checker...')
 
         # Make sure to extend the interval if the last feed check took longer
         # than the interval, then schedule the next check. Only problem with
         # this is that it requires two checks to overlap before any adjustment
         # is realized.
-        if self.delta.seconds >= self.interval:
-            self.log.info(f'Increasing the interval from {self.interval}s to {self.delta.seconds}s due to '
+        if self.delta_seconds >= self.interval:
+            new_interval = math.ceil(self.delta_seconds)
+            self.log.info(f'Increasing the interval from {self.interval}s to {new_interval}s due to '
                           'longer processing times')
-            self.interval = self.delta.seconds
+            self.interval = new_interval
 
         if repeat:
             self.schedule_next_check()
 
-        num_feeds = len(self.feeds)
+        feeds = dict(self.feeds)
+        num_feeds = len(feeds)
         if num_feeds == 0:
             self.log.info('No feeds to check.')
             return
 
         self.log.info(f'Checking {num_feeds} feeds...')
 
-        for title, feed in self.feeds.items():  # TODO: make this thread safe
-            self._send_feed(title, feed)
+        # Only the HTTP fetches run in the pool; dispatching entries and
+        # updating the feeds state stays on this thread. The feeds of a same
+        # host are fetched one after the other to avoid hammering it, and a
+        # url watched under several titles is only fetched once.
+        titles_by_url = defaultdict(list)
+        for title, feed in feeds.items():
+            if not feed.has_rooms():
+                self.log.debug(f'[{title}] No rooms subscribed, skipping.')
+                continue
+            titles_by_url[feed.url].append(title)
+        host_buckets = defaultdict(list)
+        for url in titles_by_url:
+            # Skip the feeds that are not expected to have new entries yet.
+            if not self._feed_reader(url=url).is_due():
+                self.log.debug(f'Skipping {url} until it is due.')
+                continue
+            host_buckets[urlsplit(url).netloc].append(url)
+        if not host_buckets:
+            self.log.info('No feeds with rooms due for a check.')
+            return
+
+        updates = []
+        pending = defaultdict(list)
+        handled = []
+        with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(host_buckets))) as executor:
+            futures = [executor.submit(self._fetch_bucket_sequential, urls) for urls in host_buckets.values()]
+            for future in as_completed(futures):
+                for url, feed_content in future.result():
+                    for title in titles_by_url[url]:
+                        self._dispatch_feed_content(title, feeds[title], feed_content, updates, pending, handled)
+
+        # Report the entries of all the feeds of each room in chronological
+        # order, each feed already gives its entries sorted.
+        for runs in pending.values():
+            roomfeed = runs[0][0]
+            entries = heapq.merge(*(recent_entries for __, recent_entries in runs), key=itemgetter('published_date'))
+            self._send_entries_to_room(entries, roomfeed)
+
+        # Store all the new last check times and sent entries at once.
+        if updates:
+            self.set_roomfeeds_last_check(updates)
+            self['sent_cache'] = self._sent_cache
+
+        # Only skip the entries in the next checks once they are sent and saved.
+        for title, entries in handled:
+            self._mark_seen(self._seen_entries.setdefault(title, OrderedDict()), entries)
 
         # Record the time needed for the current set of feeds.
-        end_time = arrow.get()
-        self.delta = end_time - start_time
+        self.delta_seconds = time.monotonic() - start_time
 
     def _get_room_id(self, message):
         """ Return a room ID to identify the feed reports destinations."""
@@ -162,33 +322,42 @@ class Rss(BotPlugin):
             raise ValueError('This plugin has not been implemented for '
                              'mode {}.'.format(self.mode))
 
-    def _get_sender(self, message):
-        """ Return a room ID to identify the feed reports destinations."""
-        return message.frm if message.is_direct else message.to
-
     def add_feed(self, title, url):
         """ Add a feed object."""
         new_feed = Feed(title, url)
 
-        with self.mutable('feeds') as feeds:
+        with self._feeds_lock, self.mutable('feeds') as feeds:
             feeds[title] = new_feed
 
     def add_room_to_feed(self, title, message, check_date):
-        with self.mutable('feeds') as feeds:
+        room_id = self._get_room_id(message)
+
+        with self._feeds_lock, self.mutable('feeds') as feeds:
             feeds[title].add_room(
-                room_id=self._get_room_id(message),
+                room_id=room_id,
                 message=message,
                 last_check=check_date
             )
+            url = feeds[title].url
+        self._room_to_feeds[room_id].add(title)
+        # The new room may need entries that were already handled for the
+        # others, and would not get them from a 'not modified' response or
+        # before the feed is due again.
+        self._seen_entries.pop(title, None)
+        feed_reader = self._feed_reader(url=url)
+        feed_reader.forget_validators()
+        feed_reader.make_due()
 
     def remove_feed_from_room(self, title, message):
         room_id = self._get_room_id(message)
 
-        with self.mutable('feeds') as feeds:
+        with self._feeds_lock, self.mutable('feeds') as feeds:
             feeds[title].remove_room(room_id=room_id)
 
-            if not self.feeds[title].has_rooms():
-                del self.feeds[title]
+            if not feeds[title].has_rooms():
+                del feeds[title]
+                self._seen_entries.pop(title, None)
+        self._room_to_feeds[room_id].discard(title)
 
     def _get_feeds_from_url(self, url):
         for title, feed in self.feeds.items():
@@ -196,23 +365,36 @@ class Rss(BotPlugin):
                 yield feed
 
     def set_roomfeed_last_check(self, title, room_id, date):
-        with self.mutable('feeds') as feeds:
-            feeds[title].roomfeeds[room_id].last_check = date
+        self.set_roomfeeds_last_check([(title, room_id, date)])
+
+    def set_roomfeeds_last_check(self, updates):
+        """Store several last check times in a single write of the feeds.
+
+        :param List[tuple] updates: (title, room_id, date) tuples
+        """
+        with self._feeds_lock, self.mutable('feeds') as feeds:
+            for title, room_id, date in updates:
+                # The feed or the room may have been removed during the check.
+                if title in feeds and room_id in feeds[title].roomfeeds:
+                    feeds[title].roomfeeds[room_id].last_check = date
 
     def _is_feed_in_room(self, title, room_id):
-        if title not in self.feeds:
-            return False
-        return self.feeds[title].isin(room_id)
+        feed = self.feeds.get(title)
+        return feed is not None and feed.isin(room_id)
 
     def _find_url_ini_config(self, url: str) -> Union[Dict[str, str], None]:
-        self.log.debug('Finding ini section for "{}"...'.format(url))
-        for header, section in self.ini.items():
-            if header_matches_url(header, url):
-                config = dict(section)
-                self.log.debug(f'Matched "{url}" to "{header}".')
-                return config
-        self.log.error(f'ERROR: Found no RSS config match for "{url}".')
+        if url not in self._url_config_cache:
+            self._url_config_cache[url] = self._match_url_ini_config(url)
+        return self._url_config_cache[url]
 
+    def _match_url_ini_config(self, url: str) -> Union[Dict[str, str], None]:
+        self.log.debug('Finding ini section for "{}"...'.format(url))
+        match = self._ini_index.match(url)
+        if match:
+            header, config = match
+            self.log.debug(f'Matched "{url}" to "{header}".')
+            return config
+        self.log.info(f'Found no RSS config match for "{url}", reading it without authentication.')
 
     @property
     def startup_date(self):
@@ -234,56 +416,129 @@ class Rss(BotPlugin):
             self.log.info('Scheduling disabled.')
             self.stop_checking_feeds()
 
-    def _send_feed(self, title, feed):
+    def _fetch_feed_content(self, url):
+        """Read the feed at `url`. This is the only step of a check that runs in the worker threads.
+
+        :param str url: url of the feed
+        :return: parsed feed, NOT_MODIFIED or None
+        """
+        return try_method(lambda: self._feed_reader(url=url).read(url=url))
+
+    def _fetch_bucket_sequential(self, urls):
+        """Fetch the feeds at `urls` one after the other.
+
+        :param List[str] urls: urls of the feeds, usually all on the same host
+        :return: list of (url, feed content)
+        """
+        return [(url, self._fetch_feed_content(url)) for url in urls]
+
+    def _dispatch_feed_content(self, title, feed, feed_content, updates, pending, handled):
         """
         :param str title: title of the feed
         :param Feed feed: the feed object
+        :param feed_content: the parsed feed, as returned by `_fetch_feed_content`
+        :param List[tuple] updates: where to append the (title, room_id, date) last check updates
+        :param Dict[str, list] pending: where to append the (roomfeed, recent entries) to send, by room_id
+        :param List[tuple] handled: where to append the (title, entries) to skip in the next checks
         :return:
         """
-        feed_content = self.read_feed(url=feed.url)
+        if feed_content is NOT_MODIFIED:
+            self.log.info(f'[{title}] Not modified.')
+            return
         if not feed_content:
             self.log.error(f'[{title}] No feed found!')
             return
         if not feed_content['entries']:
             self.log.info(f'[{title}] No entries yet.')
             return
-        entries = feed_content['entries']
-        # Touch up each entry.
-        for entry in entries:
-            entry['published'] = read_date(published_date(entry))
-            entry['when'] = entry['published'].humanize()
-        # sort entries
-        entries.sort(key=published_date)
-        # for each room will report the corresponding entries
+        if not feed.has_rooms():
+            return
+        # Entries handled in a previous check are older than the last check
+        # of every room, only touch up the new ones.
+        seen = self._seen_entries.get(title, ())
+        new_entries = [e for e in feed_content['entries'] if entry_id(e) is None or entry_id(e) not in seen]
+        # Drop the entries that are not newer than the last check of any room,
+        # in the same pass.
+        earliest_needed = min(roomfeed.last_check for roomfeed in feed.roomfeeds.values())
+        entries = []
+        newest_date = None
+        for entry in new_entries:
+            date = entry_date(entry)
+            if date is None:
+                self.log.info(f'[{title}] Skipping entry {entry_id(entry)!r} without a date.')
+                continue
+            entry['published_date'] = date
+            if newest_date is None or date > newest_date:
+                newest_date = date
+            if date > earliest_needed:
+                entries.append(entry)
         feed_reader = self._feed_reader(url=feed.url)
+        if newest_date is not None:
+            feed_reader.observe_newest(newest_date)
+        if not entries:
+            self.log.info(f'[{title}] No entries since {earliest_needed.humanize()}.')
+            handled.append((title, new_entries))
+            return
+        # sort entries
+        entries.sort(key=itemgetter('published_date'))
+        pub_dates = [entry['published_date'] for entry in entries]
+        # for each room will report the corresponding entries, rooms sharing
+        # the same last check time share the same recent entries
+        recent_by_date = {}
         for room_id, roomfeed in feed.roomfeeds.items():
             self.log.info(f'[{title}] Checking for entries for room {roomfeed.message.frm}.')
-            recent_entries = feed_reader.pick_recent_entries_from(
-                title=title,
-                entries=entries,
-                check_date=roomfeed.last_check
-            )
+            check_date = roomfeed.last_check
+            if check_date not in recent_by_date:
+                recent_by_date[check_date] = feed_reader.pick_recent_entries_from(
+                    title=title,
+                    entries=entries,
+                    pub_dates=pub_dates,
+                    check_date=check_date
+                )
+            recent_entries = recent_by_date[check_date]
             if recent_entries:
-                self._send_entries_to_room(recent_entries, roomfeed)
+                pending[room_id].append((roomfeed, recent_entries))
                 # Only update the last check time for this feed when there are recent entries.
                 newest = recent_entries[-1]
-                self.set_roomfeed_last_check(
-                    title, room_id, newest['published'])
-                self.log.info(f"[{title}] Updated room {room_id} last check time to {newest['when']}")
+                updates.append((title, room_id, newest['published_date']))
+                self.log.info(f"[{title}] Updated room {room_id} last check time to "
+                              f"{newest['published_date'].humanize()}")
+        handled.append((title, new_entries))
+
+    @staticmethod
+    def _mark_seen(seen, entries):
+        """Remember the ids of `entries` in the `seen` OrderedDict, keeping the most recent ones."""
+        for entry in entries:
+            key = entry_id(entry)
+            if key is not None:
+                seen[key] = True
+        while len(seen) > SEEN_CACHE_SIZE:
+            seen.popitem(last=False)
 
     def _send_entries_to_room(self, entries, roomfeed):
         """
-        :param List[dict] entries:
+        :param Iterable[dict] entries:
         :param RoomFeed roomfeed:
         :return:
         """
         # Report results from all feeds in chronological order. Note we can't
         # use yield/return here since there's no incoming message.
-        dest = self._get_sender(roomfeed.message)
+        dest = roomfeed.dest
 
-        formatter = self.entry_format_function()
+        sent = self._sent_cache.setdefault(roomfeed.room_id, OrderedDict())
         for entry in entries:
-            self.send(dest, formatter(**entry))
+            key = entry_id(entry)
+            if key in sent:
+                sent.move_to_end(key)
+                continue
+            # Only humanize the dates of the entries that are actually sent,
+            # and only once for all the rooms of the feed.
+            if 'when' not in entry:
+                entry['when'] = entry['published_date'].humanize()
+            self.send(dest, _ENTRY_FORMATTER(**entry))
+            sent[key] = True
+        while len(sent) > SENT_CACHE_SIZE:
+            sent.popitem(last=False)
 
     def _register_roomfeed(self, title: str, check_date: arrow.Arrow, url: str, config, message) -> str:
         """
@@ -314,28 +569,31 @@ class Rss(BotPlugin):
         return f'watching [{title}]({url})'
 
     def _get_first_entry_date(self, entries):
-        feed_dates = sorted([read_date(entry.get('published')) for entry in entries])
-        return feed_dates[0] if feed_dates else None
+        return min(filter(None, map(entry_date, entries)), default=None)
 
     def _feed_reader(self, url: str) -> FeedReader:
         if url not in self._feed_readers:
-            config = self._find_url_ini_config(url)
-            authenticator = Authenticator(
-                url=config['login_url'],
-                username=config['username'],
-                password=config['password']
-            )
+            config = self._find_url_ini_config(url) or {}
+            authenticator = None
+            if 'username' in config and 'password' in config:
+                authenticator = Authenticator(
+                    url=config.get('login_url', url),
+                    username=config['username'],
+                    password=config['password']
+                )
             self._feed_readers[url] = FeedReader(
                 http_session=self.session,
+                url=url,
                 authenticator=authenticator,
-                logger=self.log
+                logger=self.log,
+                parse_pool=self._parse_pool
             )
         return self._feed_readers[url]
 
     def _watch_feed(self, message, url, check_date=None):
         """Watch a new feed by URL and start checking date."""
         feed_reader = self._feed_reader(url)
-        feed = feed_reader.read(url=url)
+        feed = feed_reader.read(url=url, conditional=False)
         if feed is None:
             return f"Couldn't find a feed at {url}"
 
@@ -348,7 +606,7 @@ class Rss(BotPlugin):
             title=feed['feed']['title'],
             check_date=check_date,
             url=url,
-            config=config,
+            config=self._find_url_ini_config(url),
             message=message
         )
 
@@ -356,12 +614,16 @@ class Rss(BotPlugin):
     def rss_list(self, message, args):
         """List the feeds being watched in this room."""
         room_id = self._get_room_id(message)
-        room_feeds = [feed for title, feed in self.feeds.items() if feed.isin(room_id)]
-        if not room_feeds:
-            return 'You have 0 feeds. Add one!'
-        for feed in room_feeds:
-            last_check = feed.roomfeeds[room_id].last_check.humanize()
-            yield f'[{feed.title}]({feed.url}) {last_check}'
+        feeds = self.feeds
+        any_found = False
+        for title in sorted(self._room_to_feeds.get(room_id, ())):
+            feed = feeds.get(title)
+            if feed is not None and feed.isin(room_id):
+                any_found = True
+                last_check = feed.roomfeeds[room_id].last_check.humanize()
+                yield f'[{feed.title}]({feed.url}) {last_check}'
+        if not any_found:
+            yield 'You have 0 feeds. Add one!'
 
     @botcmd
     @arg_botcmd('url', type=str)
@@ -383,13 +645,14 @@ class Rss(BotPlugin):
     @arg_botcmd('url', type=str)
     def rss_ignore(self, message, url):
         """Ignore a currently watched feed by name."""
+        room_id = self._get_room_id(message)
         for feed in self._get_feeds_from_url(url):
-            if feed.isin(message.frm.person):
+            if feed.isin(room_id):
                 try:
                     self.remove_feed_from_room(feed.title, message)
                 except Exception as error:
                     self.log.error(
-                        f"Error when removing feed [{feed.title}] from room {message.frm.person}. "
+                        f"Error when removing feed [{feed.title}] from room {room_id}. "
                         f"{str(error)}"
                     )
                 else:
@@ -1,18 +1,46 @@
 
-class RoomFeed(object):
+class _Slotted(object):
+    """ Base for the slotted classes kept in the plugin storage.
+    """
+    __slots__ = ()
+
+    def __setstate__(self, state):
+        # Instances pickled before __slots__ was added carry a plain __dict__.
+        if isinstance(state, tuple):
+            __, state = state
+        for name, value in state.items():
+            setattr(self, name, value)
+
+
+class RoomFeed(_Slotted):
     """ Store the room ID, the message used to launch the feed
     and the last time the feed was checked.
     """
+    __slots__ = ('room_id', 'message', 'last_check', 'dest')
+
     def __init__(self, room_id, message, last_check):
         self.room_id = room_id
         self.message = message
         self.last_check = last_check
+        self.dest = self._dest_of(message)
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        if not hasattr(self, 'dest'):
+            # Stored before the destination was kept on the room feed.
+            self.dest = self._dest_of(self.message)
+
+    @staticmethod
+    def _dest_of(message):
+        """ Return where to send the entries for the room `message` comes from."""
+        return message.frm if message.is_direct else message.to
 
 
-class Feed(object):
+class Feed(_Slotted):
     """ Store the title of the feed and its the URL.
     Also a RoomFeed dict, where the key is the room_id.
     """
+    __slots__ = ('title', 'url', 'roomfeeds')
 
     def __init__(self, title, url):
         self.title = title
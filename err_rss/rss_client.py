@@ -1,79 +1,228 @@
+import re
+import bisect
 import logging
+import functools
 from urllib.parse import urlsplit
 import time
+from concurrent.futures import Executor
 
-from retry import retry
 import requests
-import feedparser
-
 from .login import Authenticator
+from .feed_parser import parse_feed
+
+
+#: Returned by `FeedReader.read` when the feed did not change since the last read.
+NOT_MODIFIED = object()
+
+#: Bounds, in seconds, of the delay before checking again a feed that just got new entries.
+MIN_CHECK_DELAY = 60
+MAX_CHECK_DELAY = 6 * 60 * 60
+
+#: Seconds to wait for a feed host to connect and to send each part of the response.
+REQUEST_TIMEOUT = 30
+
+_MAX_AGE_RE = re.compile(r'max-age=(\d+)')
 
 
 def published_date(entry):
     return entry.get('published')
 
 
-def header_matches_url(header, url):
-    # Here we compare the end of the domain and the start of the path (if
-    # present) to the header.
-    __, domain, apath, *__ = urlsplit(url)
-    parts = header.lstrip('*').split('/', 1)
-    apath = apath.lstrip('/')
-    if len(parts) == 2:
-        # Domain and path in header. Match the path starts and domain ends.
-        header_domain, header_path = parts
-        return apath.startswith(header_path) and domain.endswith(header_domain)
-    else:
-        # Domain without os.path. Match the domain ends.
-        header_domain, = parts
-        return domain.endswith(header_domain)
+def entry_id(entry):
+    return entry.get('id') or entry.get('guid') or entry.get('link') or entry.get('title')
+
+
+@functools.lru_cache(maxsize=256)
+def _split_url(url):
+    return urlsplit(url)
+
+
+class _HeaderNode:
+    __slots__ = ('children', 'sections')
+
+    def __init__(self):
+        self.children = {}
+        self.sections = []
+
+
+class HeaderIndex:
+    """Index of ini section headers to find the section matching a url.
+
+    The header domains are stored in a trie by reversed characters, so finding
+    the headers whose domain ends the url domain is a single walk down the
+    trie. The header path (if present) must also start the url path, and the
+    first matching section in file order is chosen.
+    """
+
+    def __init__(self, sections):
+        """
+        :param sections: iterable of (header, section) in file order
+        """
+        self._root = _HeaderNode()
+        for order, (header, section) in enumerate(sections):
+            parts = header.lstrip('*').split('/', 1)
+            header_domain = parts[0]
+            header_path = parts[1] if len(parts) == 2 else None
+            node = self._root
+            for char in reversed(header_domain):
+                node = node.children.setdefault(char, _HeaderNode())
+            node.sections.append((order, header_path, header, section))
+
+    def match(self, url):
+        """Return the (header, section) of the first section matching `url`, or None."""
+        __, domain, apath, *__ = _split_url(url)
+        apath = apath.lstrip('/')
+        best = None
+        node = self._root
+        chars = reversed(domain)
+        while node is not None:
+            for order, header_path, header, section in node.sections:
+                if best is not None and best[0] < order:
+                    continue
+                if header_path is None or apath.startswith(header_path):
+                    best = order, header, section
+            node = node.children.get(next(chars, None))
+        return best[1:] if best else None
 
 
 class FeedReader:
 
-    def __init__(self, http_session: requests.Session, url: str, authenticator: Authenticator, logger=None):
+    def __init__(self, http_session: requests.Session, url: str, authenticator: Authenticator = None, logger=None,
+                 parse_pool: Executor = None):
         self.session = http_session
+        self.parse_pool = parse_pool
         self.log = logger if logger else logging.getLogger(self.__class__.__name__)
         self.url = url
         self.authenticator = authenticator
+        # Validators per url, for conditional GETs.
+        self._etag = {}
+        self._last_modified = {}
+        # When the feed may have new entries, as a time.monotonic() value,
+        # estimated from the date of its newest entry and how often it gets new ones.
+        self._next_check_at = 0.0
+        self._newest = None
+        self._mean_gap = None
+
+    def _conditional_headers(self, url: str):
+        headers = {}
+        if url in self._etag:
+            headers['If-None-Match'] = self._etag[url]
+        if url in self._last_modified:
+            headers['If-Modified-Since'] = self._last_modified[url]
+        return headers
+
+    def _read_url(self, url: str, conditional: bool = True):
+        headers = self._conditional_headers(url) if conditional else {}
+        if self.authenticator is None:
+            return self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
 
-    def _read_url(self, url: str):
         session = self.authenticator.login(session=self.session)
-        return session.get(url)
-
-    @retry(Exception, tries=3, delay=2)
-    def read(self, url: str):
+        response = session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        if response.status_code in (401, 403):
+            # The login may have expired, try once more with a fresh one.
+            self.log.info(f'Got HTTP {response.status_code} from {url}, logging in again.')
+            session = self.authenticator.reauthenticate(session=self.session)
+            response = session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        return response
+
+    def read(self, url: str, conditional: bool = True):
         """Read the RSS/Atom feed at the given url.
         If no feed can be found at the given url, return None.
         :param str url: url at which to find the feed
-        :return: parsed feed or None
+        :param bool conditional: whether to return NOT_MODIFIED if the feed did
+            not change since the last read. An unconditional read does not
+            update the validators, so the next check still gets the whole feed.
+        :return: parsed feed, NOT_MODIFIED or None
         """
         try:
-            response = self._read_url(url=url)
+            response = self._read_url(url=url, conditional=conditional)
+            self._respect_max_age(response)
+            if response.status_code == 304:
+                self.log.debug(f'{url} has not been modified.')
+                return NOT_MODIFIED
             response.raise_for_status()
-            feed = feedparser.parse(response.text)
-            assert 'title' in feed['feed']
+            feed = self._parse(response.content, response.headers.get('Content-Type'))
+            if not feed['feed'].get('title'):
+                # Not a feed, retrying will not change that.
+                self.log.error(f'No feed found at {url}.')
+                return None
+            if conditional:
+                self._remember(url, response)
         except Exception as e:
             self.log.error(str(e))
             raise
         else:
             return feed
 
-    def pick_recent_entries_from(self, title, entries, check_date):
+    def _parse(self, content: bytes, content_type: str = None):
+        if self.parse_pool is None:
+            return parse_feed(content, content_type)
+        return self.parse_pool.submit(parse_feed, content, content_type).result()
+
+    def _remember(self, url: str, response):
+        """Store the validators of `response` for the next conditional GET."""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag:
+            self._etag[url] = etag
+        if last_modified:
+            self._last_modified[url] = last_modified
+
+    def forget_validators(self):
+        """Make the next read get the whole feed, even if it did not change."""
+        self._etag.clear()
+        self._last_modified.clear()
+
+    def _respect_max_age(self, response):
+        """Do not check the feed again while the server says it is fresh, for up to `MAX_CHECK_DELAY`."""
+        if response.status_code >= 400:
+            return
+        match = _MAX_AGE_RE.search(response.headers.get('Cache-Control', ''))
+        if match:
+            delay = min(int(match.group(1)), MAX_CHECK_DELAY)
+            self._next_check_at = max(self._next_check_at, time.monotonic() + delay)
+
+    def make_due(self):
+        """Check the feed on the next check, whatever its estimated or announced freshness."""
+        self._next_check_at = 0.0
+
+    def is_due(self) -> bool:
+        """Tell whether the feed may have new entries by now."""
+        return time.monotonic() >= self._next_check_at
+
+    def observe_newest(self, newest):
+        """Record the date of the newest entry of the feed.
+
+        When it is newer than the previous one, the gap between both updates
+        an average of how often the feed gets new entries, and the feed is
+        not due again before half that average.
+
+        :param arrow.Arrow newest: publication date of the newest entry
+        """
+        if self._newest is not None and newest <= self._newest:
+            return
+        if self._newest is not None:
+            gap = (newest - self._newest).total_seconds()
+            self._mean_gap = gap if self._mean_gap is None else (gap + self._mean_gap) / 2
+            delay = min(max(MIN_CHECK_DELAY, self._mean_gap / 2), MAX_CHECK_DELAY)
+            self._next_check_at = max(self._next_check_at, time.monotonic() + delay)
+        self._newest = newest
+
+    def pick_recent_entries_from(self, title, entries, pub_dates, check_date):
+        """Return the entries published after `check_date`.
+
+        :param str title: title of the feed
+        :param List[dict] entries: entries sorted by publication date
+        :param List[arrow.Arrow] pub_dates: publication date of each entry in `entries`
+        :param arrow.Arrow check_date:
+        :return: tuple of the recent entries
+        """
         # Find the oldest and newest entries
         num_entries = len(entries)
-        if num_entries == 1:
-            newest = oldest = entries[0]
-        elif num_entries == 2:
-            oldest, newest = entries
-        else:
-            oldest, *__, newest = entries
-
-        # Find recent entries
-        def is_recent(entry):
-            return entry.get('published_date') > check_date
+        oldest, newest = entries[0], entries[-1]
 
-        recent_entries = tuple(e for e in entries if is_recent(e))
+        # Find recent entries, the entries are already sorted by date.
+        recent_entries = tuple(entries[bisect.bisect_right(pub_dates, check_date):])
         num_recent = len(recent_entries)
 
         if recent_entries:
@@ -81,7 +230,7 @@ class FeedReader:
             about_then = check_date.humanize()
             self.log.info(f'[{title}] Found {num_recent} entries since {about_then}')
         else:
-            self.log.info(f"[{title}] Found {num_entries} entries since {oldest['when']}, "
-                          f"but none since {newest['when']}")
+            self.log.info(f"[{title}] Found {num_entries} entries since {oldest['published_date'].humanize()}, "
+                          f"but none since {newest['published_date'].humanize()}")
 
         return recent_entries
@@ -0,0 +1,36 @@
+import pytest
+
+from err_rss.plugin import entry_date, read_date
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('Fri, 15 Jun 2018 10:30:00 +0200', '2018-06-15T08:30:00+00:00'),
+    ('Fri, 15 Jun 2018 10:30:00 GMT', '2018-06-15T10:30:00+00:00'),
+    ('2018-06-15T10:30:00+02:00', '2018-06-15T08:30:00+00:00'),
+    ('2018-06-15T10:30:00Z', '2018-06-15T10:30:00+00:00'),
+    ('15/06/2018', '2018-06-15T00:00:00+00:00'),
+    ('01/02/2017', '2017-02-01T00:00:00+00:00'),
+    ('June 15, 2018', '2018-06-15T00:00:00+00:00'),
+])
+def test_read_date(text, expected):
+    assert read_date(text).to('UTC').isoformat() == expected
+
+
+@pytest.mark.parametrize('text', [None, 1529058600])
+def test_read_date_rejects_non_strings(text):
+    with pytest.raises(TypeError):
+        read_date(text)
+
+
+def test_read_date_rejects_text_around_a_year():
+    with pytest.raises(ValueError):
+        read_date('blah2016')
+
+
+def test_entry_date_falls_back_to_updated():
+    entry = {'title': 'T', 'updated': '2018-06-15T10:30:00Z'}
+    assert entry_date(entry).isoformat() == '2018-06-15T10:30:00+00:00'
+
+
+def test_entry_date_without_date():
+    assert entry_date({'title': 'T'}) is None
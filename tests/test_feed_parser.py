@@ -0,0 +1,81 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import feedparser
+import pytest
+
+from err_rss.feed_parser import parse_feed, parse_feed_fast
+from err_rss.plugin import entry_date
+from err_rss.rss_client import FeedReader
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>RSS feed</title><link>https://example.com/</link>
+<item><title>First</title><link>https://example.com/1</link><guid>urn:1</guid>
+<pubDate>Fri, 15 Jun 2018 10:30:00 GMT</pubDate></item>
+<item><title>Second</title><link>https://example.com/2</link>
+<pubDate>Sat, 16 Jun 2018 10:30:00 +0200</pubDate></item>
+</channel></rss>
+"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Atom feed</title>
+<link href="https://example.com/"/><id>urn:feed</id><updated>2018-06-16T10:30:00Z</updated>
+<entry><title>First</title><link rel="edit" href="https://example.com/edit/1"/>
+<link rel="alternate" href="https://example.com/1"/><id>urn:1</id>
+<published>2018-06-15T10:30:00Z</published><updated>2018-06-15T11:00:00Z</updated></entry>
+<entry><title>Second</title><link href="https://example.com/2"/><id>urn:2</id>
+<updated>2018-06-16T10:30:00Z</updated></entry>
+</feed>
+"""
+
+RDF = b"""<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns="http://purl.org/rss/1.0/"
+         xmlns:dc="http://purl.org/dc/elements/1.1/">
+<channel rdf:about="https://example.com/"><title>RDF feed</title><link>https://example.com/</link></channel>
+<item rdf:about="https://example.com/1"><title>First</title><link>https://example.com/1</link>
+<dc:date>2018-06-15T10:30:00Z</dc:date></item>
+</rdf:RDF>
+"""
+
+# Not well-formed: the ampersand is not escaped.
+BOZO_RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>T</title>
+<item><title>Fish & chips</title><link>https://example.com/1</link></item>
+</channel></rss>
+"""
+
+
+def _used_fields(entry):
+    return {
+        'title': entry.get('title'),
+        'link': entry.get('link'),
+        'id': entry.get('id'),
+        'date': entry_date(entry),
+    }
+
+
+@pytest.mark.parametrize('content', [RSS, ATOM, RDF], ids=['rss', 'atom', 'rdf'])
+def test_parse_feed_fast_reads_what_feedparser_reads(content):
+    fast = parse_feed_fast(content)
+    slow = feedparser.parse(content)
+    assert fast['feed']['title'] == slow['feed']['title']
+    assert [_used_fields(e) for e in fast['entries']] == [_used_fields(e) for e in slow['entries']]
+
+
+def test_parse_feed_fast_needs_a_feed_title():
+    with pytest.raises(ValueError):
+        parse_feed_fast(b'<html><body><p>Not a feed</p></body></html>')
+
+
+def test_parse_feed_falls_back_to_feedparser():
+    feed = parse_feed(BOZO_RSS)
+    assert feed['feed']['title'] == 'T'
+    assert feed['bozo']
+    assert isinstance(feed['bozo_exception'], str)
+
+
+def test_parse_bozo_feed_in_a_process():
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        reader = FeedReader(http_session=None, url='https://example.com/rss', parse_pool=pool)
+        feed = reader._parse(BOZO_RSS, 'application/rss+xml')
+    assert feed['feed']['title'] == 'T'
+    assert feed['entries'][0]['link'] == 'https://example.com/1'
@@ -0,0 +1,92 @@
+import itertools
+import time
+from urllib.parse import urlsplit
+
+import pytest
+import requests
+
+from err_rss.rss_client import MAX_CHECK_DELAY, FeedReader, HeaderIndex
+
+HEADERS = [
+    'example.com/private',
+    '*.example.com',
+    'example.com',
+    'news.example.org/feeds/team',
+    'example.org',
+    'le.com',
+    '*ample.net/a',
+]
+
+URLS = [
+    'https://example.com/private/feed.xml',
+    'https://example.com/public/feed.xml',
+    'https://www.example.com/private/rss',
+    'https://news.example.org/feeds/team/atom',
+    'https://news.example.org/feeds/other',
+    'https://sample.com/rss',
+    'https://example.net/a/b',
+    'https://sample.net/ab',
+    'https://example.net/b',
+    'https://example.io/rss',
+    'https://example.com',
+]
+
+
+def header_matches_url(header, url):
+    """How ini section headers were matched before HeaderIndex."""
+    __, domain, apath, *__ = urlsplit(url)
+    parts = header.lstrip('*').split('/', 1)
+    apath = apath.lstrip('/')
+    if len(parts) == 2:
+        header_domain, header_path = parts
+        return apath.startswith(header_path) and domain.endswith(header_domain)
+    else:
+        header_domain, = parts
+        return domain.endswith(header_domain)
+
+
+def first_matching_header(headers, url):
+    return next((header for header in headers if header_matches_url(header, url)), None)
+
+
+@pytest.mark.parametrize('headers', list(itertools.permutations(HEADERS, 3)) + [HEADERS, HEADERS[::-1], []])
+def test_header_index_matches_like_a_sweep(headers):
+    index = HeaderIndex((header, {'header': header}) for header in headers)
+    for url in URLS:
+        match = index.match(url)
+        expected = first_matching_header(headers, url)
+        if expected is None:
+            assert match is None, url
+        else:
+            assert match == (expected, {'header': expected}), url
+
+
+def test_header_index_prefers_the_first_section():
+    index = HeaderIndex([('example.com', {'order': 1}), ('www.example.com', {'order': 2})])
+    assert index.match('https://www.example.com/rss') == ('example.com', {'order': 1})
+
+
+def _response(status_code, cache_control):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+
+def test_max_age_postpones_the_next_check():
+    reader = FeedReader(http_session=None, url='https://example.com/rss')
+    reader._respect_max_age(_response(200, 'public, max-age=600'))
+    assert not reader.is_due()
+    assert reader._next_check_at <= time.monotonic() + 600
+
+
+def test_max_age_is_bounded():
+    reader = FeedReader(http_session=None, url='https://example.com/rss')
+    reader._respect_max_age(_response(200, 'max-age=31536000'))
+    assert reader._next_check_at <= time.monotonic() + MAX_CHECK_DELAY
+
+
+def test_max_age_of_errors_is_ignored():
+    reader = FeedReader(http_session=None, url='https://example.com/rss')
+    reader._respect_max_age(_response(503, 'max-age=600'))
+    assert reader.is_due()